@@ -1,9 +1,11 @@
-"""Environment-based configuration."""
+"""Environment-based configuration. Values are read once per process and cached."""
 
 import os
+from functools import lru_cache
 from pathlib import Path
 
 
+@lru_cache(maxsize=1)
 def get_installer_path() -> Path:
     """Root path where GOG installers live (dir with exe or .rar)."""
     raw = os.environ.get("GOG_INSTALLER_PATH", "")
@@ -12,6 +14,7 @@ def get_installer_path() -> Path:
     return Path(raw).resolve()
 
 
+@lru_cache(maxsize=1)
 def get_metadata_path() -> Path:
     """Root path for metadata (game.json, screenshots, videos)."""
     raw = os.environ.get("GOG_METADATA_PATH", "")
@@ -20,11 +23,35 @@ def get_metadata_path() -> Path:
     return Path(raw).resolve()
 
 
+@lru_cache(maxsize=1)
 def get_scan_schedule() -> str:
     """Cron-like or 'daily' for auto scan. Empty = on-demand only."""
     return os.environ.get("GOG_SCAN_SCHEDULE", "").strip()
 
 
+@lru_cache(maxsize=1)
 def get_discord_webhook_url() -> str:
     """Optional Discord webhook URL for events."""
     return os.environ.get("DISCORD_WEBHOOK_URL", "").strip()
+
+
+@lru_cache(maxsize=1)
+def get_scan_concurrency() -> int:
+    """How many new games a scan fetches from GOG at once (default 8, min 1)."""
+    raw = os.environ.get("GOG_SCAN_CONCURRENCY", "").strip()
+    try:
+        return max(1, int(raw)) if raw else 8
+    except ValueError:
+        return 8
+
+
+def _reset_config_cache() -> None:
+    """Forget cached values so the next call re-reads the environment (for tests)."""
+    for getter in (
+        get_installer_path,
+        get_metadata_path,
+        get_scan_schedule,
+        get_discord_webhook_url,
+        get_scan_concurrency,
+    ):
+        getter.cache_clear()
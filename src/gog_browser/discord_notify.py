@@ -1,4 +1,4 @@
-"""Discord webhook notifications for scan events."""
+"""Discord webhook notifications for scan events (async, on a caller-provided httpx client)."""
 
 import logging
 from typing import Any
@@ -10,10 +10,10 @@ logger = logging.getLogger(__name__)
 USER_AGENT = "GOG-Games-Browser/0.1"
 
 
-def _post_sync(url: str, payload: dict) -> None:
-    """Fire-and-forget POST; log on failure."""
+async def _post(client: httpx.AsyncClient, url: str, payload: dict) -> None:
+    """Best-effort POST; log on failure, never raise."""
     try:
-        r = httpx.post(
+        r = await client.post(
             url,
             json=payload,
             headers={"User-Agent": USER_AGENT, "Content-Type": "application/json"},
@@ -25,16 +25,18 @@ def _post_sync(url: str, payload: dict) -> None:
         logger.warning("Discord webhook error: %s", e)
 
 
-def notify_scan_started(webhook_url: str) -> None:
+async def notify_scan_started(client: httpx.AsyncClient, webhook_url: str) -> None:
     if not webhook_url:
         return
-    _post_sync(
+    await _post(
+        client,
         webhook_url,
         {"content": "GOG Games Browser: Scan started."},
     )
 
 
-def notify_scan_finished(
+async def notify_scan_finished(
+    client: httpx.AsyncClient,
     webhook_url: str,
     added: int = 0,
     removed: int = 0,
@@ -44,7 +46,8 @@ def notify_scan_finished(
     if not webhook_url:
         return
     desc = f"Total: {total} | Added: {added} | Removed: {removed} | Updated: {changed}"
-    _post_sync(
+    await _post(
+        client,
         webhook_url,
         {
             "embeds": [
@@ -58,12 +61,15 @@ def notify_scan_finished(
     )
 
 
-def notify_new_games(webhook_url: str, game_names: list[str], limit: int = 10) -> None:
+async def notify_new_games(
+    client: httpx.AsyncClient, webhook_url: str, game_names: list[str], limit: int = 10
+) -> None:
     if not webhook_url or not game_names:
         return
     names = game_names[:limit]
     extra = f" and {len(game_names) - limit} more" if len(game_names) > limit else ""
-    _post_sync(
+    await _post(
+        client,
         webhook_url,
         {
             "embeds": [
@@ -77,12 +83,15 @@ def notify_new_games(webhook_url: str, game_names: list[str], limit: int = 10) -
     )
 
 
-def notify_games_removed(webhook_url: str, game_keys: list[str], limit: int = 10) -> None:
+async def notify_games_removed(
+    client: httpx.AsyncClient, webhook_url: str, game_keys: list[str], limit: int = 10
+) -> None:
     if not webhook_url or not game_keys:
         return
     keys = game_keys[:limit]
     extra = f" and {len(game_keys) - limit} more" if len(game_keys) > limit else ""
-    _post_sync(
+    await _post(
+        client,
         webhook_url,
         {
             "embeds": [
@@ -96,10 +105,13 @@ def notify_games_removed(webhook_url: str, game_keys: list[str], limit: int = 10
     )
 
 
-def notify_error(webhook_url: str, message: str, detail: str = "") -> None:
+async def notify_error(
+    client: httpx.AsyncClient, webhook_url: str, message: str, detail: str = ""
+) -> None:
     if not webhook_url:
         return
-    _post_sync(
+    await _post(
+        client,
         webhook_url,
         {
             "embeds": [
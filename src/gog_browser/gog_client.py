@@ -2,16 +2,77 @@
 
 import asyncio
 import json
+import os
 import re
+import tempfile
+import time
 from pathlib import Path
 from typing import Any
 
 import httpx
+from aiolimiter import AsyncLimiter
+
+from gog_browser.metadata import FILE_MODE, GAME_JSON, write_json
 
 EMBED_SEARCH_URL = "https://embed.gog.com/games/ajax/filtered"
 PRODUCT_URL = "https://api.gog.com/products/{id}"
 USER_AGENT = "GOG-Games-Browser/0.1 (https://github.com/gog-games-browser)"
-REQUEST_DELAY = 0.8  # Between product fetches to avoid 429
+API_RATE = 5  # Requests per second to each GOG API host
+ASSET_RATE = 20  # Requests per second to image/CDN hosts
+CLIENT_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=30.0)
+CLIENT_TIMEOUT = httpx.Timeout(20.0, connect=10.0)
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^\w\-_.]")
+
+
+def create_client() -> httpx.AsyncClient:
+    """
+    Build the AsyncClient used for GOG requests: HTTP/2, pooled keep-alive connections
+    and a default User-Agent. Reuse one client for many requests so they share sockets.
+    """
+    return httpx.AsyncClient(
+        http2=True,
+        limits=CLIENT_LIMITS,
+        timeout=CLIENT_TIMEOUT,
+        headers={"User-Agent": USER_AGENT},
+    )
+
+
+WARM_UP_URLS = ("https://embed.gog.com/", "https://api.gog.com/")
+
+
+async def warm_up(client: httpx.AsyncClient) -> None:
+    """
+    Open pooled connections to the GOG API hosts (HEAD requests) so a search or product
+    fetch soon after startup skips DNS and the TLS handshake. Idle connections close after
+    CLIENT_LIMITS.keepalive_expiry (30 s), so later requests connect as usual. Failures are ignored.
+    """
+    await asyncio.gather(
+        *(client.head(url, timeout=5.0) for url in WARM_UP_URLS), return_exceptions=True
+    )
+
+
+_HOST_LIMITERS = {
+    "api.gog.com": AsyncLimiter(API_RATE, 1.0),
+    "embed.gog.com": AsyncLimiter(API_RATE, 1.0),
+}
+_ASSET_LIMITER = AsyncLimiter(ASSET_RATE, 1.0)
+_resume_at: dict[str, float] = {}  # host -> monotonic time when a 429 back-off ends
+
+
+async def _throttle(url: str) -> None:
+    """Wait for the host's rate limit (and any pending 429 back-off) before a request."""
+    host = httpx.URL(url).host
+    delay = _resume_at.get(host, 0.0) - time.monotonic()
+    if delay > 0:
+        await asyncio.sleep(delay)
+    await _HOST_LIMITERS.get(host, _ASSET_LIMITER).acquire()
+
+
+def _back_off(url: str, seconds: float) -> None:
+    """Hold all further requests to url's host for the given number of seconds."""
+    host = httpx.URL(url).host
+    _resume_at[host] = max(_resume_at.get(host, 0.0), time.monotonic() + seconds)
 
 
 async def search_game(client: httpx.AsyncClient, query: str) -> dict | None:
@@ -21,10 +82,11 @@ async def search_game(client: httpx.AsyncClient, query: str) -> dict | None:
     if not query or not query.strip():
         return None
     try:
+        await _throttle(EMBED_SEARCH_URL)
         r = await client.get(
             EMBED_SEARCH_URL,
             params={"mediaType": "game", "search": query.strip(), "limit": 5},
-            headers={"User-Agent": USER_AGENT, "Referer": "https://www.gog.com/"},
+            headers={"Referer": "https://www.gog.com/"},
             timeout=15.0,
         )
         r.raise_for_status()
@@ -52,18 +114,18 @@ async def get_product(
     """
     url = PRODUCT_URL.format(id=product_id)
     try:
+        await _throttle(url)
         r = await client.get(
             url,
             params={"locale": "en_US", "expand": expand},
-            headers={"User-Agent": USER_AGENT},
             timeout=20.0,
         )
         if r.status_code == 429:
             retry_after = r.headers.get("Retry-After", "10")
             try:
-                await asyncio.sleep(float(retry_after))
+                _back_off(url, float(retry_after))
             except ValueError:
-                await asyncio.sleep(10.0)
+                _back_off(url, 10.0)
             return await get_product(client, product_id, expand)
         r.raise_for_status()
         return r.json()
@@ -105,17 +167,29 @@ def _ensure_https(url: str) -> str:
 
 
 async def download_asset(client: httpx.AsyncClient, url: str, dest: Path) -> bool:
-    """Download a single asset to dest. Returns True on success."""
+    """
+    Stream a single asset to dest in chunks (via a unique temp file in dest's folder,
+    renamed when complete). Returns True on success.
+    """
     url = _ensure_https(url)
     if not url:
         return False
+    tmp: str | None = None
     try:
-        r = await client.get(url, headers={"User-Agent": USER_AGENT}, timeout=30.0)
-        r.raise_for_status()
-        dest.parent.mkdir(parents=True, exist_ok=True)
-        dest.write_bytes(r.content)
+        await _throttle(url)
+        async with client.stream("GET", url, timeout=30.0) as r:
+            r.raise_for_status()
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=dest.parent, prefix=dest.name + ".", suffix=".part")
+            with os.fdopen(fd, "wb") as f:
+                async for chunk in r.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                    await asyncio.to_thread(f.write, chunk)
+        os.chmod(tmp, FILE_MODE)  # mkstemp creates 0600
+        os.replace(tmp, dest)
         return True
     except (httpx.HTTPError, OSError):
+        if tmp is not None:
+            Path(tmp).unlink(missing_ok=True)
         return False
 
 
@@ -147,27 +221,56 @@ def _video_urls(api_videos: list, limit: int = 3) -> list[tuple[str, str]]:
 
 
 def _safe_filename(name: str) -> str:
-    name = re.sub(r"[^\w\-_.]", "_", name)
+    name = _UNSAFE_FILENAME_CHARS.sub("_", name)
     return name[:200] or "file"
 
 
+def _image_ext(url: str) -> str:
+    return ".jpg" if ".jpg" in url.split("?")[0] else ".png"
+
+
+def _already_downloaded(dest: Path) -> bool:
+    """True if dest exists and is non-empty (download_asset only renames complete files into place)."""
+    try:
+        return dest.stat().st_size > 0
+    except OSError:
+        return False
+
+
+async def _download_many(
+    client: httpx.AsyncClient,
+    jobs: list[tuple[str, Path]],
+    subdir: str,
+    reuse_existing: bool = True,
+) -> list[str]:
+    """
+    Download (url, dest) pairs in parallel. Return subdir-relative paths of successful dests, in order.
+    With reuse_existing, dests already on disk count as done and are not fetched again.
+    """
+    # One download per dest (first url wins): jobs sharing a file name must not race on it
+    unique: dict[Path, str] = {}
+    for url, dest in jobs:
+        unique.setdefault(dest, url)
+    missing = [
+        (url, dest) for dest, url in unique.items() if not (reuse_existing and _already_downloaded(dest))
+    ]
+    ok = await asyncio.gather(*(download_asset(client, url, dest) for url, dest in missing))
+    failed = {dest for (_, dest), done in zip(missing, ok) if not done}
+    return [f"{subdir}/{dest.name}" for dest in unique if dest not in failed]
+
+
 async def download_screenshots(
     client: httpx.AsyncClient,
     api_screenshots: list,
     base_dir: Path,
     limit: int = 10,
+    reuse_existing: bool = True,
 ) -> list[str]:
     """Download up to limit screenshots into base_dir/screenshots/. Return relative paths."""
     urls = _screenshot_urls(api_screenshots, limit)
-    rel_paths = []
     screenshots_dir = base_dir / "screenshots"
-    for i, url in enumerate(urls):
-        ext = ".jpg" if ".jpg" in url.split("?")[0] else ".png"
-        dest = screenshots_dir / f"{i:02d}{ext}"
-        if await download_asset(client, url, dest):
-            rel_paths.append(f"screenshots/{dest.name}")
-        await asyncio.sleep(0.2)
-    return rel_paths
+    jobs = [(url, screenshots_dir / f"{i:02d}{_image_ext(url)}") for i, url in enumerate(urls)]
+    return await _download_many(client, jobs, "screenshots", reuse_existing)
 
 
 async def download_videos(
@@ -175,19 +278,16 @@ async def download_videos(
     api_videos: list,
     base_dir: Path,
     limit: int = 3,
+    reuse_existing: bool = True,
 ) -> list[str]:
     """Download video thumbnails into base_dir/videos/. Return relative paths."""
     pairs = _video_urls(api_videos, limit)
-    rel_paths = []
     videos_dir = base_dir / "videos"
-    for i, (url, vid_id) in enumerate(pairs):
-        ext = ".jpg" if ".jpg" in url.split("?")[0] else ".png"
-        name = _safe_filename(vid_id) or f"thumb_{i}"
-        dest = videos_dir / f"{name}{ext}"
-        if await download_asset(client, url, dest):
-            rel_paths.append(f"videos/{dest.name}")
-        await asyncio.sleep(0.2)
-    return rel_paths
+    jobs = [
+        (url, videos_dir / f"{_safe_filename(str(vid_id)) if vid_id else f'thumb_{i}'}{_image_ext(url)}")
+        for i, (url, vid_id) in enumerate(pairs)
+    ]
+    return await _download_many(client, jobs, "videos", reuse_existing)
 
 
 async def fetch_and_save_game(
@@ -196,34 +296,44 @@ async def fetch_and_save_game(
     metadata_dir: Path,
     *,
     download_assets: bool = True,
+    reuse_assets: bool = True,
     screenshot_limit: int = 10,
     video_limit: int = 3,
 ) -> dict | None:
     """
     Fetch product from API, normalize to game.json, optionally download assets.
     Writes metadata_dir/game.json and metadata_dir/screenshots|videos.
+    With reuse_assets, asset files already on disk are kept instead of re-downloaded.
     Returns normalized game dict or None.
     """
     raw = await get_product(client, product_id)
     if not raw:
         return None
-    await asyncio.sleep(REQUEST_DELAY)
     game = _normalize_game_json(raw)
     metadata_dir = Path(metadata_dir)
     metadata_dir.mkdir(parents=True, exist_ok=True)
     if download_assets:
-        game["screenshots_local"] = await download_screenshots(
-            client, game.get("screenshots") or [], metadata_dir, limit=screenshot_limit
-        )
-        game["videos_local"] = await download_videos(
-            client, game.get("videos") or [], metadata_dir, limit=video_limit
+        # Screenshots and video thumbnails stream side by side over the same connections
+        game["screenshots_local"], game["videos_local"] = await asyncio.gather(
+            download_screenshots(
+                client,
+                game.get("screenshots") or [],
+                metadata_dir,
+                limit=screenshot_limit,
+                reuse_existing=reuse_assets,
+            ),
+            download_videos(
+                client,
+                game.get("videos") or [],
+                metadata_dir,
+                limit=video_limit,
+                reuse_existing=reuse_assets,
+            ),
         )
     else:
         game["screenshots_local"] = []
         game["videos_local"] = []
-    game_path = metadata_dir / "game.json"
-    with open(game_path, "w", encoding="utf-8") as f:
-        json.dump(game, f, indent=2, ensure_ascii=False)
+    write_json(metadata_dir / GAME_JSON, game)
     return game
 
 
@@ -234,6 +344,7 @@ async def resolve_and_save(
     *,
     product_id_override: int | None = None,
     download_assets: bool = True,
+    reuse_assets: bool = True,
 ) -> dict | None:
     """
     Resolve game by search name (or product_id_override), then fetch and save.
@@ -241,10 +352,16 @@ async def resolve_and_save(
     Returns normalized game dict or None.
     """
     if product_id_override is not None:
-        return await fetch_and_save_game(client, product_id_override, metadata_dir, download_assets=download_assets)
+        return await fetch_and_save_game(
+            client,
+            product_id_override,
+            metadata_dir,
+            download_assets=download_assets,
+            reuse_assets=reuse_assets,
+        )
     hit = await search_game(client, search_name)
     if not hit or hit.get("id") is None:
         return None
     return await fetch_and_save_game(
-        client, hit["id"], metadata_dir, download_assets=download_assets
+        client, hit["id"], metadata_dir, download_assets=download_assets, reuse_assets=reuse_assets
     )
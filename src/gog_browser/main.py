@@ -9,6 +9,7 @@ def run():
         "gog_browser.web.app:app",
         host="0.0.0.0",
         port=8000,
+        loop="auto",  # uvloop when installed (Linux/macOS), plain asyncio otherwise
         reload=False,
     )
 
@@ -1,51 +1,97 @@
 """Metadata store: per-game folders, scan state, and merge for API."""
 
-import json
+import copy
+import os
+import tempfile
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
+
+import orjson
 
 SCAN_STATE_FILE = "_scan_state.json"
 GAME_JSON = "game.json"
 OVERRIDE_JSON = "override.json"
+FILE_MODE = 0o644  # metadata files are world-readable, as plain open() would create them
+
+
+def read_json(path: Path) -> Any:
+    """Parse a JSON file. Raises OSError or orjson.JSONDecodeError on failure."""
+    return orjson.loads(Path(path).read_bytes())
+
+
+def write_json(path: Path, data: Any, *, indent: bool = True) -> None:
+    """
+    Write JSON to a unique temp file next to path, then swap it in so readers never see a
+    partial file and concurrent writers never share one. The temp file is removed on failure.
+    """
+    option = orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE if indent else 0
+    body = orjson.dumps(data, option=option)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(body)
+        os.chmod(tmp, FILE_MODE)  # mkstemp creates 0600
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
 
 
+@lru_cache(maxsize=4096)
+def _read_json_cached(path: str, ino: int, mtime_ns: int, ctime_ns: int, size: int) -> Any:
+    """Parsed JSON for a file version; the stat fields are only part of the cache key."""
+    return read_json(Path(path))
+
+
+def _load_json_file(path: Path) -> dict | None:
+    """
+    Load a JSON object file, reparsing only when its inode, times or size changed
+    (write_json's replace gives every rewrite a new inode, even within one mtime tick).
+    Returns a deep copy (callers may edit it), or None if missing or unreadable.
+    """
+    try:
+        st = path.stat()
+        data = _read_json_cached(str(path), st.st_ino, st.st_mtime_ns, st.st_ctime_ns, st.st_size)
+    except (orjson.JSONDecodeError, OSError):
+        return None
+    return copy.deepcopy(data) if isinstance(data, dict) else None
+
+
+# Maps every Latin-1 character that is not alphanumeric or one of "._-" to "_"
+_UNSAFE_KEY_TABLE = str.maketrans(
+    {c: "_" for c in map(chr, range(256)) if not (c.isalnum() or c in "._-")}
+)
+
+
+def _safe_key(game_key: str) -> str:
+    """Folder name for a game key: keep alphanumerics and "._-", replace everything else."""
+    if max(game_key, default="") <= "\xff":
+        return game_key.translate(_UNSAFE_KEY_TABLE)
+    return "".join(c if c.isalnum() or c in "._-" else "_" for c in game_key)
+
+
+@lru_cache(maxsize=8192)
 def get_game_dir(metadata_root: Path, game_key: str) -> Path:
     """Path to a game's metadata folder (may not exist yet)."""
-    safe_key = "".join(c if c.isalnum() or c in "._-" else "_" for c in game_key)
-    return metadata_root / safe_key
+    return metadata_root / _safe_key(game_key)
 
 
 def load_game_json(metadata_root: Path, game_key: str) -> dict | None:
     """Load game.json for a game. Returns None if missing."""
-    path = get_game_dir(metadata_root, game_key) / GAME_JSON
-    if not path.exists():
-        return None
-    try:
-        with open(path, encoding="utf-8") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, OSError):
-        return None
+    return _load_json_file(get_game_dir(metadata_root, game_key) / GAME_JSON)
 
 
 def load_override(metadata_root: Path, game_key: str) -> dict | None:
     """Load override.json (gog_search_name, product_id, etc.). Returns None if missing."""
-    path = get_game_dir(metadata_root, game_key) / OVERRIDE_JSON
-    if not path.exists():
-        return None
-    try:
-        with open(path, encoding="utf-8") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, OSError):
-        return None
+    return _load_json_file(get_game_dir(metadata_root, game_key) / OVERRIDE_JSON)
 
 
 def save_override(metadata_root: Path, game_key: str, data: dict) -> None:
     """Write override.json for a game."""
     dir_path = get_game_dir(metadata_root, game_key)
     dir_path.mkdir(parents=True, exist_ok=True)
-    path = dir_path / OVERRIDE_JSON
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    write_json(dir_path / OVERRIDE_JSON, data)
 
 
 def get_search_name(metadata_root: Path, game_key: str, default: str) -> str:
@@ -67,42 +113,90 @@ def get_product_id_override(metadata_root: Path, game_key: str) -> int | None:
     return None
 
 
+def iter_game_keys(metadata_root: Path) -> Iterator[str]:
+    """
+    Yield game keys that have a metadata folder (game.json or override), in directory order.
+    Symlinked game folders count, as with Path.is_dir().
+    """
+    try:
+        it = os.scandir(metadata_root)
+    except OSError:
+        return
+    with it:
+        for d in it:
+            if d.name.startswith("_") or not d.is_dir():
+                continue
+            if os.path.isfile(os.path.join(d.path, GAME_JSON)) or os.path.isfile(
+                os.path.join(d.path, OVERRIDE_JSON)
+            ):
+                yield d.name
+
+
 def list_game_keys(metadata_root: Path) -> list[str]:
     """List all game keys that have a metadata folder (game.json or override)."""
-    root = Path(metadata_root)
-    if not root.is_dir():
-        return []
-    keys = []
-    for d in root.iterdir():
-        if d.is_dir() and not d.name.startswith("_"):
-            if (d / GAME_JSON).exists() or (d / OVERRIDE_JSON).exists():
-                keys.append(d.name)
-    return sorted(keys)
+    return sorted(iter_game_keys(metadata_root))
+
+
+# Bumped by mark_metadata_changed; covers changes the root mtime can't distinguish
+# (coarse timestamps on SMB/FAT mounts put two changes in the same tick).
+_metadata_generation = 0
+
+
+def metadata_generation() -> int:
+    """In-process counter of mark_metadata_changed calls; part of cache keys with the root mtime."""
+    return _metadata_generation
+
+
+def mark_metadata_changed(metadata_root: Path) -> None:
+    """
+    Bump the in-process generation and the metadata root's mtime so caches keyed on them
+    (e.g. the games list) refresh.
+    """
+    global _metadata_generation
+    _metadata_generation += 1
+    try:
+        os.utime(metadata_root)
+    except OSError:
+        pass
 
 
 def load_scan_state(metadata_root: Path) -> dict:
-    """Load _scan_state.json. Returns dict with keys set, last_scan, etc."""
+    """Load _scan_state.json. Returns dict with installer_keys, last_scan, rar_index."""
     path = Path(metadata_root) / SCAN_STATE_FILE
     if not path.exists():
-        return {"installer_keys": [], "last_scan": None}
+        return {"installer_keys": [], "last_scan": None, "rar_index": {}}
     try:
-        with open(path, encoding="utf-8") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, OSError):
-        return {"installer_keys": [], "last_scan": None}
+        return read_json(path)
+    except (orjson.JSONDecodeError, OSError):
+        return {"installer_keys": [], "last_scan": None, "rar_index": {}}
 
 
-def save_scan_state(metadata_root: Path, installer_keys: list[str]) -> None:
-    """Persist current installer keys and timestamp."""
+def save_scan_state(
+    metadata_root: Path,
+    installer_keys: list[str],
+    rar_index: dict | None = None,
+) -> None:
+    """Persist current installer keys, timestamp and RAR listing cache (see scan_installers)."""
     import time
     path = Path(metadata_root) / SCAN_STATE_FILE
     path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(
-            {"installer_keys": installer_keys, "last_scan": time.time()},
-            f,
-            indent=2,
-        )
+    write_json(
+        path,
+        {"installer_keys": installer_keys, "last_scan": time.time(), "rar_index": rar_index or {}},
+        indent=False,
+    )
+
+
+def load_all_metadata(metadata_root: Path) -> dict[str, tuple[dict | None, dict | None]]:
+    """
+    Load every game folder in one directory pass: folder name -> (game.json, override.json).
+    Folder names are get_game_dir(...).name for a key (see iter_game_keys).
+    """
+    root = Path(metadata_root)
+    return {
+        key: (_load_json_file(root / key / GAME_JSON), _load_json_file(root / key / OVERRIDE_JSON))
+        for key in iter_game_keys(root)
+    }
 
 
 def merge_game_with_installer(
@@ -114,6 +208,21 @@ def merge_game_with_installer(
     Build API-ready game dict: installer info + game.json + overrides.
     installer_entry: dict with key, path_type, fs_path (str), internal_path, display_name.
     """
+    return build_game_dict(
+        game_key,
+        installer_entry,
+        load_game_json(metadata_root, game_key),
+        load_override(metadata_root, game_key),
+    )
+
+
+def build_game_dict(
+    game_key: str,
+    installer_entry: dict,
+    game: dict | None,
+    ov: dict | None,
+) -> dict:
+    """API-ready game dict from already-loaded game.json and override (no disk access)."""
     out: dict[str, Any] = {
         "id": game_key,
         "key": game_key,
@@ -129,10 +238,8 @@ def merge_game_with_installer(
         "videos_local": [],
         "gog_search_name_override": None,
     }
-    ov = load_override(metadata_root, game_key)
     if ov and ov.get("gog_search_name"):
         out["gog_search_name_override"] = ov["gog_search_name"]
-    game = load_game_json(metadata_root, game_key)
     if game:
         out["gog_title"] = game.get("title")
         out["gog_slug"] = game.get("slug")
@@ -167,4 +274,4 @@ def get_game_by_key_only(metadata_root: Path, game_key: str) -> dict | None:
         "internal_path": (ov or {}).get("internal_path"),
         "display_name": (ov or {}).get("display_name", game_key),
     }
-    return merge_game_with_installer(metadata_root, game_key, synthetic_entry)
+    return build_game_dict(game_key, synthetic_entry, game, ov)
@@ -6,7 +6,12 @@ from pathlib import Path
 
 import httpx
 
-from gog_browser.config import get_discord_webhook_url, get_installer_path, get_metadata_path
+from gog_browser.config import (
+    get_discord_webhook_url,
+    get_installer_path,
+    get_metadata_path,
+    get_scan_concurrency,
+)
 from gog_browser.discord_notify import (
     notify_error,
     notify_new_games,
@@ -14,13 +19,14 @@ from gog_browser.discord_notify import (
     notify_scan_started,
     notify_games_removed,
 )
-from gog_browser.gog_client import resolve_and_save
+from gog_browser.gog_client import create_client, resolve_and_save
 from gog_browser.metadata import (
     get_game_dir,
     get_product_id_override,
     get_search_name,
     load_override,
     load_scan_state,
+    mark_metadata_changed,
     save_override,
     save_scan_state,
 )
@@ -39,104 +45,200 @@ def _installer_entry_to_dict(e: InstallerEntry) -> dict:
     }
 
 
+async def _fetch_new_game(
+    client: httpx.AsyncClient,
+    sem: asyncio.Semaphore,
+    metadata_path: Path,
+    entry: InstallerEntry,
+) -> tuple[str | None, str | None]:
+    """
+    Resolve one newly discovered installer on GOG and save its metadata and override.
+    Returns (game title, error message); one of them is None.
+    """
+    key = entry.key
+    game_dir = get_game_dir(metadata_path, key)
+    search_name = get_search_name(metadata_path, key, entry.display_name)
+    product_id = get_product_id_override(metadata_path, key)
+    override_data = {
+        "gog_search_name": search_name,
+        "installer_path": str(entry.fs_path),
+        "path_type": entry.path_type,
+        "internal_path": entry.internal_path,
+        "display_name": entry.display_name,
+    }
+    async with sem:
+        try:
+            game = await resolve_and_save(
+                client,
+                search_name,
+                game_dir,
+                product_id_override=product_id,
+                download_assets=True,
+            )
+        except Exception as e:
+            logger.exception("Failed to fetch game %s", key)
+            save_override(metadata_path, key, override_data)
+            return None, f"{key}: {e}"
+    save_override(metadata_path, key, override_data)
+    if game:
+        return game.get("title") or entry.display_name, None
+    return None, f"No GOG match: {key} ({search_name})"
+
+
+async def _send_notifications(queue: asyncio.Queue) -> None:
+    """Await queued Discord post coroutines one by one, in order, until a None sentinel."""
+    try:
+        while (coro := await queue.get()) is not None:
+            await coro
+    finally:
+        # Cancelled: close whatever was never sent so it doesn't warn as never awaited
+        while not queue.empty():
+            pending = queue.get_nowait()
+            if pending is not None:
+                pending.close()
+
+
 async def run_scan(
     *,
     installer_path: Path | None = None,
     metadata_path: Path | None = None,
     discord_url: str | None = None,
+    client: httpx.AsyncClient | None = None,
 ) -> dict:
     """
     Run full scan: discover installers, diff with last state, fetch GOG for new/changed,
     save metadata, update state, send Discord notifications.
+    Pass a long-lived client (see gog_client.create_client) to reuse its connection pool.
     Returns summary: added, removed, changed, total, errors.
     """
+    if client is None:
+        async with create_client() as client:
+            return await run_scan(
+                installer_path=installer_path,
+                metadata_path=metadata_path,
+                discord_url=discord_url,
+                client=client,
+            )
+
     installer_path = installer_path or get_installer_path()
     metadata_path = metadata_path or get_metadata_path()
     discord_url = discord_url or get_discord_webhook_url()
 
-    notify_scan_started(discord_url)
-
-    metadata_path = Path(metadata_path)
-    metadata_path.mkdir(parents=True, exist_ok=True)
-
-    entries = scan_installers(installer_path)
-    current_keys = {e.key for e in entries}
-    prev = load_scan_state(metadata_path)
-    prev_keys = set(prev.get("installer_keys") or [])
-
-    added_keys = current_keys - prev_keys
-    removed_keys = prev_keys - current_keys
-    # "Changed" = still present; we could detect content change later. For now treat as 0 or "updated" count after fetch.
-    entry_by_key = {e.key: e for e in entries}
-
-    new_game_names: list[str] = []
-    errors: list[str] = []
-
-    async with httpx.AsyncClient() as client:
-        for key in added_keys:
-            entry = entry_by_key.get(key)
-            if not entry:
+    # Discord posts go through one sender task so they arrive in order, one at a time;
+    # the queue is flushed (or, if the scan is cancelled, dropped) before returning
+    notifications: asyncio.Queue = asyncio.Queue()
+    sender = asyncio.create_task(_send_notifications(notifications))
+    notify = notifications.put_nowait
+    try:
+        notify(notify_scan_started(client, discord_url))
+
+        metadata_path = Path(metadata_path)
+        metadata_path.mkdir(parents=True, exist_ok=True)
+
+        prev = load_scan_state(metadata_path)
+        rar_index = prev.get("rar_index") or {}
+        # Filesystem walk and RAR listing are blocking; keep them off the event loop
+        entries = await asyncio.to_thread(scan_installers, installer_path, rar_index)
+        entry_by_key = {e.key: e for e in entries}
+        current_keys = entry_by_key.keys()  # set-like view, no second pass over entries
+        prev_keys = set(prev.get("installer_keys") or [])
+
+        added_keys = current_keys - prev_keys
+        removed_keys = prev_keys - current_keys
+        # "Changed" = still present; we could detect content change later. For now treat as 0 or "updated" count after fetch.
+
+        sem = asyncio.Semaphore(get_scan_concurrency())
+        added = list(added_keys)
+        # return_exceptions: one failing game (e.g. override write error) must not abort the
+        # scan and leave its sibling fetches running unawaited
+        results = await asyncio.gather(
+            *(_fetch_new_game(client, sem, metadata_path, entry_by_key[key]) for key in added),
+            return_exceptions=True,
+        )
+        new_game_names = []
+        errors = []
+        for key, res in zip(added, results):
+            if isinstance(res, BaseException):
+                logger.error("Failed to add game %s", key, exc_info=res)
+                errors.append(f"{key}: {res}")
                 continue
-            game_dir = get_game_dir(metadata_path, key)
-            search_name = get_search_name(metadata_path, key, entry.display_name)
-            product_id = get_product_id_override(metadata_path, key)
-            override_data = {
-                "gog_search_name": search_name,
-                "installer_path": str(entry.fs_path),
-                "path_type": entry.path_type,
-                "internal_path": entry.internal_path,
-                "display_name": entry.display_name,
-            }
-            try:
-                game = await resolve_and_save(
-                    client,
-                    search_name,
-                    game_dir,
-                    product_id_override=product_id,
-                    download_assets=True,
-                )
-                if game:
-                    new_game_names.append(game.get("title") or entry.display_name)
-                else:
-                    errors.append(f"No GOG match: {key} ({search_name})")
-                save_override(metadata_path, key, override_data)
-            except Exception as e:
-                logger.exception("Failed to fetch game %s", key)
-                errors.append(f"{key}: {e}")
-                save_override(metadata_path, key, override_data)
-
-    if new_game_names:
-        notify_new_games(discord_url, new_game_names)
-    if removed_keys:
-        notify_games_removed(discord_url, list(removed_keys))
-    if errors:
-        notify_error(discord_url, "Scan had errors", "\n".join(errors[:5]))
-
-    # Keep installer path in override for all current entries (for detail API)
-    for key in current_keys:
-        entry = entry_by_key.get(key)
-        if entry:
-            ov = load_override(metadata_path, key) or {}
+            name, err = res
+            if name:
+                new_game_names.append(name)
+            if err:
+                errors.append(err)
+
+        if new_game_names:
+            notify(notify_new_games(client, discord_url, new_game_names))
+        if removed_keys:
+            notify(notify_games_removed(client, discord_url, list(removed_keys)))
+        if errors:
+            notify(notify_error(client, discord_url, "Scan had errors", "\n".join(errors[:5])))
+
+        # Keep installer path in override for all current entries (for detail API).
+        # Only rewrite override.json when something actually changed.
+        for key, entry in entry_by_key.items():
+            current = load_override(metadata_path, key) or {}
+            ov = dict(current)
             ov["installer_path"] = str(entry.fs_path)
             ov["path_type"] = entry.path_type
             ov["internal_path"] = entry.internal_path
             ov["display_name"] = entry.display_name
-            if "gog_search_name" not in ov:
-                ov["gog_search_name"] = get_search_name(metadata_path, key, entry.display_name)
-            save_override(metadata_path, key, ov)
-
-    save_scan_state(metadata_path, list(current_keys))
-    notify_scan_finished(
-        discord_url,
-        added=len(added_keys),
-        removed=len(removed_keys),
-        changed=0,
-        total=len(current_keys),
-    )
+            # No search name stored yet means get_search_name would fall back to display_name
+            ov.setdefault("gog_search_name", entry.display_name)
+            if ov != current:
+                save_override(metadata_path, key, ov)
+
+        save_scan_state(metadata_path, list(current_keys), rar_index)
+        mark_metadata_changed(metadata_path)
+        notify(
+            notify_scan_finished(
+                client,
+                discord_url,
+                added=len(added_keys),
+                removed=len(removed_keys),
+                changed=0,
+                total=len(current_keys),
+            )
+        )
+
+        return {
+            "added": len(added_keys),
+            "removed": len(removed_keys),
+            "total": len(current_keys),
+            "errors": errors,
+        }
+    except asyncio.CancelledError:
+        sender.cancel()
+        raise
+    finally:
+        notifications.put_nowait(None)
+        await asyncio.gather(sender, return_exceptions=True)
+
+
+# The one scan in flight, shared by the API and the scheduler so they never overlap.
+# No lock needed: start_scan's done()-check and create_task run without an await between.
+_scan_task: asyncio.Task | None = None
+
+
+def _log_scan_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Background scan failed", exc_info=task.exception())
+
+
+def start_scan(client: httpx.AsyncClient) -> tuple[asyncio.Task, bool]:
+    """
+    Start run_scan as a background task on the running loop unless a scan is in progress.
+    Returns (task, started); when started is False, task is the scan already running.
+    """
+    global _scan_task
+    if _scan_task is not None and not _scan_task.done():
+        return _scan_task, False
+    _scan_task = asyncio.create_task(run_scan(client=client))
+    _scan_task.add_done_callback(_log_scan_failure)
+    return _scan_task, True
 
-    return {
-        "added": len(added_keys),
-        "removed": len(removed_keys),
-        "total": len(current_keys),
-        "errors": errors,
-    }
+
+def current_scan() -> asyncio.Task | None:
+    """The running or most recently finished background scan, if any."""
+    return _scan_task
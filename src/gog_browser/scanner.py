@@ -1,7 +1,9 @@
 """Discover GOG installers: setup_*.exe on disk or inside .rar archives."""
 
+import os
 import re
 from dataclasses import dataclass
+from itertools import chain
 from pathlib import Path
 from typing import Iterator
 
@@ -12,7 +14,9 @@ except ImportError:
 
 SETUP_PATTERN = re.compile(r"^setup_.*\.exe$", re.IGNORECASE)
 RAR_EXT = ".rar"
-PART_RAR_PATTERN = re.compile(r"\.part\d+\.rar$", re.IGNORECASE)
+PART_RAR_PATTERN = re.compile(r"\.part(\d+)\.rar$", re.IGNORECASE)
+_PART_STEM = re.compile(r"\.part\d+$", re.IGNORECASE)
+_INVALID_KEY_CHARS = re.compile(r'[\\/:*?"<>|]')
 
 
 @dataclass
@@ -29,11 +33,9 @@ class InstallerEntry:
 def _sanitize_key(relative_path: str, internal: str | None = None) -> str:
     """Build a filesystem-safe key from path (and optional internal path)."""
     # Replace path separators and invalid chars with underscore
-    key = relative_path.replace("\\", "_").replace("/", "_")
-    for c in ':*?"<>|':
-        key = key.replace(c, "_")
+    key = _INVALID_KEY_CHARS.sub("_", relative_path)
     if internal:
-        key = key + "_" + internal.replace("\\", "_").replace("/", "_")
+        key += "_" + _INVALID_KEY_CHARS.sub("_", internal)
     return key.strip("_") or "unknown"
 
 
@@ -43,7 +45,7 @@ def _display_name_from_path(fs_path: Path, internal_path: str | None) -> str:
         # Use RAR stem (e.g. "Game_Name" from "Game_Name.part01.rar")
         stem = fs_path.stem
         if PART_RAR_PATTERN.search(fs_path.name):
-            stem = re.sub(r"\.part\d+$", "", stem, flags=re.IGNORECASE)
+            stem = _PART_STEM.sub("", stem)
         return stem.replace("_", " ").strip() or fs_path.name
     # Direct exe: use parent folder name
     parent = fs_path.parent
@@ -52,60 +54,110 @@ def _display_name_from_path(fs_path: Path, internal_path: str | None) -> str:
     return fs_path.stem.replace("_", " ").strip() or "Unknown"
 
 
-def _scan_direct(root: Path) -> Iterator[InstallerEntry]:
-    """Find setup_*.exe files directly on the filesystem."""
-    for path in root.rglob("*"):
-        if not path.is_file():
+def _walk_files(root: Path) -> Iterator[os.DirEntry]:
+    """
+    Yield every file under root in a single os.scandir pass, in a stable order: each
+    directory's files sorted by name, then its subdirectories (depth-first, by name).
+    Symlinked directories are not descended into; unreadable directories are skipped.
+    """
+    stack = [str(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                listing = sorted(it, key=lambda e: e.name)
+        except OSError:
             continue
-        if SETUP_PATTERN.match(path.name):
+        subdirs = []
+        for entry in listing:
             try:
-                rel = path.relative_to(root)
-            except ValueError:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.is_file():
+                    yield entry
+            except OSError:
                 continue
-            key = _sanitize_key(str(rel), None)
-            yield InstallerEntry(
-                key=key,
-                path_type="file",
-                fs_path=path,
-                internal_path=None,
-                display_name=_display_name_from_path(path, None),
-            )
+        # Reversed so the stack pops them in name order
+        stack.extend(reversed(subdirs))
 
 
-def _is_first_rar_part(path: Path) -> bool:
+def _direct_entry(root: Path, path: Path) -> InstallerEntry | None:
+    """Build the entry for a setup_*.exe found directly on the filesystem."""
+    try:
+        rel = path.relative_to(root)
+    except ValueError:
+        return None
+    return InstallerEntry(
+        key=_sanitize_key(str(rel), None),
+        path_type="file",
+        fs_path=path,
+        internal_path=None,
+        display_name=_display_name_from_path(path, None),
+    )
+
+
+def _is_first_rar_part(name: str) -> bool:
     """True if this is a multi-part RAR we should open (e.g. .rar or .part01.rar)."""
-    if path.suffix.lower() == RAR_EXT and path.name.lower().endswith(RAR_EXT):
-        if PART_RAR_PATTERN.search(path.name):
-            # part01.rar, part1.rar etc - only process part 1
-            m = re.search(r"\.part(\d+)\.rar$", path.name, re.IGNORECASE)
-            return m is not None and int(m.group(1)) == 1
-        return True  # single .rar
-    return False
+    if not name.lower().endswith(RAR_EXT):
+        return False
+    m = PART_RAR_PATTERN.search(name)
+    # part01.rar, part1.rar etc - only process part 1; plain .rar is a single archive
+    return m is None or int(m.group(1)) == 1
 
 
-def _scan_rar(root: Path, rar_path: Path) -> Iterator[InstallerEntry]:
-    """List RAR contents and yield entries for setup_*.exe inside."""
+def _list_rar_setups(rar_path: Path) -> list[str] | None:
+    """Names of setup_*.exe inside a RAR, or None if the archive cannot be listed."""
     if rarfile is None:
-        return
+        return None
     try:
         rf = rarfile.RarFile(rar_path)
     except (rarfile.BadRarFile, rarfile.Error, OSError):
-        return
+        return None
     try:
-        names = rf.namelist()
+        infos = rf.infolist()
     except Exception:
+        return None
+    names = []
+    for info in infos:
+        name = info.filename
+        # Cheap suffix test first; most entries in a GOG archive are data files
+        if name[-4:].lower() != ".exe" or info.is_dir():
+            continue
+        if SETUP_PATTERN.match(name.rsplit("/", 1)[-1].rsplit("\\", 1)[-1]):
+            names.append(name)
+    return names
+
+
+def _cached_rar_setups(
+    rar_path: Path,
+    st: os.stat_result,
+    prev_index: dict,
+    new_index: dict,
+) -> list[str]:
+    """
+    setup_*.exe names inside rar_path, reusing prev_index when mtime and size are unchanged.
+    Successful listings are recorded in new_index.
+    """
+    cache_key = str(rar_path)
+    cached = prev_index.get(cache_key) or {}
+    if cached.get("mtime") == st.st_mtime_ns and cached.get("size") == st.st_size:
+        names = cached.get("names") or []
+    else:
+        names = _list_rar_setups(rar_path)
+        if names is None:
+            return []
+    new_index[cache_key] = {"mtime": st.st_mtime_ns, "size": st.st_size, "names": names}
+    return names
+
+
+def _scan_rar(root: Path, rar_path: Path, names: list[str]) -> Iterator[InstallerEntry]:
+    """Yield entries for the setup_*.exe names listed inside a RAR."""
+    try:
+        rel = rar_path.relative_to(root)
+    except ValueError:
         return
     for name in names:
-        base = name.replace("\\", "/").split("/")[-1]
-        if not SETUP_PATTERN.match(base):
-            continue
-        try:
-            rel = rar_path.relative_to(root)
-        except ValueError:
-            continue
-        key = _sanitize_key(str(rel), name)
         yield InstallerEntry(
-            key=key,
+            key=_sanitize_key(str(rel), name),
             path_type="rar",
             fs_path=rar_path,
             internal_path=name,
@@ -113,41 +165,52 @@ def _scan_rar(root: Path, rar_path: Path) -> Iterator[InstallerEntry]:
         )
 
 
-def _scan_rar_files(root: Path) -> Iterator[InstallerEntry]:
-    """Find .rar (and first part) and list setup_*.exe inside."""
-    seen_bases: set[str] = set()
-    for path in root.rglob("*"):
-        if not path.is_file():
-            continue
-        if path.suffix.lower() != RAR_EXT:
-            continue
-        if not _is_first_rar_part(path):
-            continue
-        # Avoid processing same logical archive twice (e.g. game.rar and game.part01.rar)
-        base = path.stem
-        if PART_RAR_PATTERN.search(path.name):
-            base = re.sub(r"\.part\d+$", "", base, flags=re.IGNORECASE)
-        if base in seen_bases:
-            continue
-        seen_bases.add(base)
-        yield from _scan_rar(root, path)
-
-
-def scan_installers(installer_root: Path) -> list[InstallerEntry]:
+def scan_installers(installer_root: Path, rar_index: dict | None = None) -> list[InstallerEntry]:
     """
     Recursively discover all GOG installers under installer_root.
-    Returns list of InstallerEntry (direct setup_*.exe and setup_*.exe inside .rar).
+    Returns list of InstallerEntry (direct setup_*.exe and setup_*.exe inside .rar), in a
+    deterministic order (sorted walk; direct installers first).
+    The tree is walked once; direct installers take precedence over RAR contents on key clashes.
+    rar_index (str(rar path) -> mtime, size, setup names) lets unchanged archives skip
+    being reopened; it is updated in place to describe the archives seen by this scan.
     """
     installer_root = installer_root.resolve()
     if not installer_root.is_dir():
         return []
+    direct: list[InstallerEntry] = []
+    rars: list[tuple[Path, os.stat_result]] = []
+    seen_bases: set[str] = set()
+    for dir_entry in _walk_files(installer_root):
+        name = dir_entry.name
+        if SETUP_PATTERN.match(name):
+            entry = _direct_entry(installer_root, Path(dir_entry.path))
+            if entry:
+                direct.append(entry)
+        elif _is_first_rar_part(name):
+            # Avoid processing same logical archive twice (e.g. game.rar and game.part01.rar)
+            base = _PART_STEM.sub("", name[: -len(RAR_EXT)])
+            if base in seen_bases:
+                continue
+            seen_bases.add(base)
+            try:
+                rars.append((Path(dir_entry.path), dir_entry.stat()))
+            except OSError:
+                continue
+    prev_index = dict(rar_index or {})
+    new_index: dict = {}
+    rar_entries = [
+        entry
+        for rar_path, st in rars
+        for entry in _scan_rar(
+            installer_root, rar_path, _cached_rar_setups(rar_path, st, prev_index, new_index)
+        )
+    ]
+    if rar_index is not None:
+        rar_index.clear()
+        rar_index.update(new_index)
     entries: list[InstallerEntry] = []
     seen_keys: set[str] = set()
-    for entry in _scan_direct(installer_root):
-        if entry.key not in seen_keys:
-            seen_keys.add(entry.key)
-            entries.append(entry)
-    for entry in _scan_rar_files(installer_root):
+    for entry in chain(direct, rar_entries):
         if entry.key not in seen_keys:
             seen_keys.add(entry.key)
             entries.append(entry)
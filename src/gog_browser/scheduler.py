@@ -1,27 +1,30 @@
-"""APScheduler: run full scan on schedule (cron or 'daily')."""
+"""APScheduler: run full scan on schedule (cron or 'daily') on the app's event loop."""
 
 import asyncio
 import logging
+import re
+from functools import lru_cache
 from typing import Any
 
-from apscheduler.schedulers.background import BackgroundScheduler
+import httpx
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.cron import CronTrigger
+from fastapi import FastAPI
 
 from gog_browser.config import get_scan_schedule
-from gog_browser.scan_flow import run_scan
+from gog_browser.scan_flow import start_scan
 
 logger = logging.getLogger(__name__)
 
-_scheduler: BackgroundScheduler | None = None
+_scheduler: AsyncIOScheduler | None = None
 
 
-def _run_scan_sync() -> None:
-    """Called by scheduler in background thread; run async run_scan."""
-    try:
-        asyncio.run(run_scan())
-    except Exception as e:
-        logger.exception("Scheduled scan failed: %s", e)
+_CRON_FIELDS = ("minute", "hour", "day", "month", "day_of_week")
+# Five whitespace-separated fields of digits, names (mon, jan), and * / , - ?
+_CRON_RE = re.compile(r"^[0-9a-z*/,?\-]+(?:\s+[0-9a-z*/,?\-]+){4}$")
 
 
+@lru_cache(maxsize=8)
 def _parse_schedule(schedule: str) -> dict[str, Any] | None:
     """
     Parse GOG_SCAN_SCHEDULE. Supports:
@@ -34,29 +37,49 @@ def _parse_schedule(schedule: str) -> dict[str, Any] | None:
         return None
     if schedule in ("daily", "day"):
         return {"hour": 2, "minute": 0}
-    parts = schedule.split()
-    if len(parts) == 5:
-        # cron: minute hour day month day_of_week
-        return {
-            "minute": parts[0],
-            "hour": parts[1],
-            "day": parts[2],
-            "month": parts[3],
-            "day_of_week": parts[4],
-        }
-    return None
+    if not _CRON_RE.match(schedule):
+        logger.warning(
+            "Ignoring invalid GOG_SCAN_SCHEDULE %r: expected 'daily' or 5 cron fields", schedule
+        )
+        return None
+    cron_kw = dict(zip(_CRON_FIELDS, schedule.split()))
+    try:
+        CronTrigger(**cron_kw)
+    except ValueError as e:
+        logger.warning("Ignoring invalid GOG_SCAN_SCHEDULE %r: %s", schedule, e)
+        return None
+    return cron_kw
 
 
-def start_scheduler() -> None:
-    """Start background scheduler if GOG_SCAN_SCHEDULE is set."""
+async def _scheduled_scan(client: httpx.AsyncClient) -> None:
+    """Cron job: start a scan through the shared guard, skipping if one is already running."""
+    _, started = start_scan(client)
+    if not started:
+        logger.info("Scheduled scan skipped: a scan is already running.")
+
+
+def start_scheduler(app: FastAPI) -> None:
+    """
+    Start the scheduler on the running event loop if GOG_SCAN_SCHEDULE is set.
+    Scheduled scans reuse the app's shared httpx client and are skipped while any scan
+    (scheduled or API-triggered) is running.
+    """
     global _scheduler
     schedule = get_scan_schedule()
     cron_kw = _parse_schedule(schedule)
     if cron_kw is None:
         logger.info("No scan schedule set; only on-demand scan available.")
         return
-    _scheduler = BackgroundScheduler()
-    _scheduler.add_job(_run_scan_sync, "cron", **cron_kw, id="gog_scan")
+    _scheduler = AsyncIOScheduler(event_loop=asyncio.get_running_loop())
+    _scheduler.add_job(
+        _scheduled_scan,
+        "cron",
+        **cron_kw,
+        id="gog_scan",
+        args=[app.state.http_client],
+        max_instances=1,
+        coalesce=True,
+    )
     _scheduler.start()
     logger.info("Scan scheduler started: %s", schedule)
 
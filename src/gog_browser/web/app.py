@@ -1,41 +1,110 @@
 """Minimal FastAPI app entry."""
 
-from contextlib import asynccontextmanager
+import asyncio
+import os
+from contextlib import asynccontextmanager, suppress
+from mimetypes import guess_type
 from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.staticfiles import NotModifiedResponse
+from starlette.types import Scope
 
+from gog_browser.gog_client import create_client, warm_up
+from gog_browser.scan_flow import current_scan
 from gog_browser.scheduler import start_scheduler, stop_scheduler
+from gog_browser.web.responses import OrjsonResponse
+from gog_browser.web.routes import api_router
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    start_scheduler()
+    # One pooled HTTP/2 client for all GOG requests made by the API
+    app.state.http_client = create_client()
+    # Warm the pool in the background (helps only requests within the 30 s keep-alive);
+    # startup does not wait for GOG to answer
+    warm_up_task = asyncio.create_task(warm_up(app.state.http_client))
+    start_scheduler(app)
     yield
     stop_scheduler()
+    warm_up_task.cancel()
+    # A background scan still running would hit the closed client; stop it first
+    scan = current_scan()
+    if scan is not None and not scan.done():
+        scan.cancel()
+        with suppress(asyncio.CancelledError):
+            await scan
+    await app.state.http_client.aclose()
 
 
-app = FastAPI(title="GOG Games Browser", version="0.1.0", lifespan=lifespan)
+class PrecompressedStatic(StaticFiles):
+    """
+    StaticFiles that serves a pre-built .br / .gz sibling (e.g. app.js.br) when the client
+    accepts that encoding and the sibling is at least as new as the original file.
+    """
+
+    encodings = (("br", ".br"), ("gzip", ".gz"))
+
+    def file_response(
+        self,
+        full_path: str | os.PathLike[str],
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        accepted = {
+            part.split(";")[0].strip() for part in request_headers.get("accept-encoding", "").split(",")
+        }
+        for encoding, suffix in self.encodings:
+            if encoding not in accepted:
+                continue
+            try:
+                compressed_stat = os.stat(f"{full_path}{suffix}")
+            except OSError:
+                continue
+            if compressed_stat.st_mtime < stat_result.st_mtime:
+                continue
+            response = FileResponse(
+                f"{full_path}{suffix}",
+                status_code=status_code,
+                stat_result=compressed_stat,
+                media_type=guess_type(str(full_path))[0] or "application/octet-stream",
+                headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"},
+            )
+            break
+        else:
+            response = FileResponse(
+                full_path,
+                status_code=status_code,
+                stat_result=stat_result,
+                headers={"Vary": "Accept-Encoding"},
+            )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+app = FastAPI(
+    title="GOG Games Browser",
+    version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=OrjsonResponse,
+)
 
 
 def mount_static_and_routes():
-    """Mount static assets and include API router."""
+    """Include API router, then mount static assets and the UI (index.html at /)."""
+    app.include_router(api_router, prefix="/api", tags=["api"])
     static_dir = Path(__file__).parent / "static"
     if static_dir.exists():
-        app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
-    from gog_browser.web.routes import api_router
-    app.include_router(api_router, prefix="/api", tags=["api"])
-
-
-@app.get("/")
-async def root():
-    """Serve the main UI (index.html) or fallback."""
-    index = Path(__file__).parent / "static" / "index.html"
-    if index.exists():
-        return FileResponse(index)
-    return {"message": "GOG Games Browser", "docs": "/docs"}
+        app.mount("/static", PrecompressedStatic(directory=str(static_dir)), name="static")
+        # Catch-all mount goes last so /api, /static and /docs resolve first
+        app.mount("/", PrecompressedStatic(directory=str(static_dir), html=True), name="ui")
 
 
 mount_static_and_routes()
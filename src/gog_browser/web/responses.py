@@ -0,0 +1,30 @@
+"""Response classes shared by the UI and API routes."""
+
+import os
+from pathlib import Path
+from typing import Any
+
+import orjson
+from fastapi.responses import FileResponse, JSONResponse
+
+
+class OrjsonResponse(JSONResponse):
+    """JSONResponse rendered with orjson; the app's default response class."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
+def file_response(
+    path: Path,
+    stat_result: os.stat_result | None = None,
+    headers: dict[str, str] | None = None,
+) -> FileResponse:
+    """
+    FileResponse with the stat done up front, so Starlette skips its own threaded os.stat.
+    Starlette sends the file as http.response.pathsend (server-side sendfile) when the
+    ASGI server advertises that extension, and falls back to chunked reads otherwise.
+    """
+    if stat_result is None:
+        stat_result = os.stat(path)
+    return FileResponse(path, stat_result=stat_result, headers=headers)
@@ -1,39 +1,94 @@
 """API routes for games list, detail, scan, override, and metadata assets."""
 
+import asyncio
+import hashlib
+import os
+import stat
+from functools import lru_cache
 from pathlib import Path
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from pydantic import BaseModel
 
 from gog_browser.config import get_installer_path, get_metadata_path
 from gog_browser.metadata import (
+    build_game_dict,
     get_game_by_key_only,
     get_game_dir,
     get_product_id_override,
     get_search_name,
-    merge_game_with_installer,
+    load_all_metadata,
+    load_override,
+    load_scan_state,
+    mark_metadata_changed,
+    metadata_generation,
     save_override,
 )
 from gog_browser.scanner import scan_installers
-from gog_browser.scan_flow import _installer_entry_to_dict, run_scan
+from gog_browser.scan_flow import _installer_entry_to_dict, current_scan, start_scan
 from gog_browser.gog_client import resolve_and_save
+from gog_browser.web.responses import file_response
 import httpx
 
 api_router = APIRouter()
 
+# Screenshots/thumbnails only change when a scan or refresh re-downloads them
+ASSET_CACHE_CONTROL = "public, max-age=86400"
+
+
+def get_http_client(request: Request) -> httpx.AsyncClient:
+    """Shared httpx client created in the app lifespan."""
+    return request.app.state.http_client
+
+
+# (installer root mtime_ns, metadata root mtime_ns, metadata generation)
+#   -> (serialized /games body, its ETag).
+# Scans, overrides and refreshes bump the generation and root mtime (mark_metadata_changed).
+_games_cache: tuple[tuple[int, int, int], bytes, str] | None = None
+
+
+def _payload_etag(body: bytes) -> str:
+    return 'W/"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+
+
+def _games_payload(installer_path: Path, metadata_path: Path) -> bytes:
+    """Serialized /games payload: current installers joined with all metadata loaded in one pass."""
+    # Reuse the last scan's RAR listings so unchanged archives are not reopened per request
+    rar_index = load_scan_state(metadata_path).get("rar_index") or {}
+    entries = scan_installers(installer_path, rar_index)
+    metadata = load_all_metadata(metadata_path)
+    out = []
+    for e in entries:
+        game, ov = metadata.get(get_game_dir(metadata_path, e.key).name, (None, None))
+        out.append(build_game_dict(e.key, _installer_entry_to_dict(e), game, ov))
+    return orjson.dumps({"games": out, "total": len(out)})
+
 
 @api_router.get("/games")
-async def list_games():
-    """List all games: current installers merged with metadata."""
+async def list_games(request: Request):
+    """List all games: current installers merged with metadata (cached until either root changes)."""
+    global _games_cache
     installer_path = get_installer_path()
     metadata_path = get_metadata_path()
-    entries = scan_installers(installer_path)
-    out = []
-    for e in entries:
-        entry_dict = _installer_entry_to_dict(e)
-        out.append(merge_game_with_installer(metadata_path, e.key, entry_dict))
-    return {"games": out, "total": len(out)}
+    try:
+        key = (
+            os.stat(installer_path).st_mtime_ns,
+            os.stat(metadata_path).st_mtime_ns,
+            metadata_generation(),
+        )
+    except OSError:
+        key = None
+    if key is None or _games_cache is None or _games_cache[0] != key:
+        # Built completely (in a worker thread) before responding, so failures surface as 5xx
+        body = await asyncio.to_thread(_games_payload, installer_path, metadata_path)
+        if key is None:
+            return Response(body, media_type="application/json")
+        _games_cache = (key, body, _payload_etag(body))
+    _, body, etag = _games_cache
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(body, media_type="application/json", headers={"ETag": etag})
 
 
 @api_router.get("/games/{game_id}")
@@ -57,25 +112,40 @@ async def set_override(game_id: str, body: OverrideBody):
     metadata_path = get_metadata_path()
     game_dir = get_game_dir(metadata_path, game_id)
     game_dir.mkdir(parents=True, exist_ok=True)
-    from gog_browser.metadata import load_override
     ov = load_override(metadata_path, game_id) or {}
     if body.gog_search_name is not None:
         ov["gog_search_name"] = (body.gog_search_name or "").strip() or None
     if body.product_id is not None:
         ov["product_id"] = body.product_id
     save_override(metadata_path, game_id, ov)
+    mark_metadata_changed(metadata_path)
     return {"ok": True, "override": ov}
 
 
 @api_router.post("/scan")
-async def trigger_scan():
-    """Run full scan (sync). Returns summary."""
-    result = await run_scan()
-    return result
+async def trigger_scan(client: httpx.AsyncClient = Depends(get_http_client)):
+    """Start a full scan in the background. Poll GET /scan/status for the summary."""
+    _, started = start_scan(client)
+    return {"status": "started" if started else "already_running"}
+
+
+@api_router.get("/scan/status")
+async def scan_status():
+    """State of the last scan (API or scheduled): idle, running, done (with result) or failed (with error)."""
+    task = current_scan()
+    if task is None:
+        return {"status": "idle"}
+    if not task.done():
+        return {"status": "running"}
+    if task.cancelled():
+        return {"status": "failed", "error": "cancelled"}
+    if task.exception() is not None:
+        return {"status": "failed", "error": str(task.exception())}
+    return {"status": "done", "result": task.result()}
 
 
 @api_router.post("/games/{game_id}/refresh")
-async def refresh_game(game_id: str):
+async def refresh_game(game_id: str, client: httpx.AsyncClient = Depends(get_http_client)):
     """Re-fetch GOG data for this game and save (uses override search name or product_id)."""
     metadata_path = get_metadata_path()
     game_dir = get_game_dir(metadata_path, game_id)
@@ -86,37 +156,65 @@ async def refresh_game(game_id: str):
             status_code=400,
             detail="Set gog_search_name or product_id override first",
         )
-    async with httpx.AsyncClient() as client:
-        game = await resolve_and_save(
-            client,
-            search_name or " ",
-            game_dir,
-            product_id_override=product_id,
-            download_assets=True,
-        )
+    game = await resolve_and_save(
+        client,
+        search_name or " ",
+        game_dir,
+        product_id_override=product_id,
+        download_assets=True,
+        # The override may now point at a different product; don't keep its old images
+        reuse_assets=False,
+    )
+    mark_metadata_changed(metadata_path)
     if game is None:
         raise HTTPException(status_code=502, detail="GOG lookup failed")
     return {"ok": True, "title": game.get("title")}
 
 
-def _safe_metadata_path(metadata_root: Path, game_id: str, subpath: str) -> Path | None:
-    """Resolve game_id/subpath under metadata root; ensure no path escape."""
-    base = get_game_dir(metadata_root, game_id)
-    full = (base / subpath).resolve()
+_BAD_PATH_PARTS = frozenset(("", ".", ".."))
+
+
+@lru_cache(maxsize=4)
+def _root_prefix(metadata_root: Path) -> str:
+    """Canonical metadata root plus separator; resolved once per process."""
+    return os.path.join(os.path.realpath(metadata_root), "")
+
+
+def _safe_metadata_path(
+    metadata_root: Path, game_id: str, subpath: str
+) -> tuple[Path, os.stat_result] | None:
+    """Resolve game_id/subpath under metadata root; ensure no path escape. Returns (path, stat)."""
+    # Reject traversal, absolute paths and NUL bytes before touching the filesystem
+    if not subpath or "\x00" in subpath or subpath[0] in "/\\":
+        return None
+    if any(part in _BAD_PATH_PARTS for part in subpath.replace("\\", "/").split("/")):
+        return None
+    full = os.path.realpath(get_game_dir(metadata_root, game_id) / subpath)
+    if not full.startswith(_root_prefix(metadata_root)):
+        return None
     try:
-        full.relative_to(metadata_root.resolve())
-    except ValueError:
+        st = os.stat(full)
+    except OSError:
         return None
-    if not full.exists() or not full.is_file():
+    if not stat.S_ISREG(st.st_mode):
         return None
-    return full
+    return Path(full), st
 
 
 @api_router.get("/metadata/{game_id}/{path:path}")
-async def serve_metadata_asset(game_id: str, path: str):
-    """Serve a file from a game's metadata folder (e.g. screenshots, videos)."""
+@api_router.head("/metadata/{game_id}/{path:path}")
+async def serve_metadata_asset(game_id: str, path: str, request: Request):
+    """
+    Serve a file from a game's metadata folder (e.g. screenshots, videos).
+    Supports HEAD and Range requests (handled by FileResponse) so media can seek.
+    """
     metadata_path = get_metadata_path()
-    safe = _safe_metadata_path(metadata_path, game_id, path)
-    if safe is None:
+    found = _safe_metadata_path(metadata_path, game_id, path)
+    if found is None:
         raise HTTPException(status_code=404, detail="Not found")
-    return FileResponse(safe)
+    full, st = found
+    etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+    headers = {"ETag": etag, "Cache-Control": ASSET_CACHE_CONTROL}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return file_response(full, st, headers=headers)
@@ -74,6 +74,19 @@ async function loadGames() {
   }
 }
 
+async function waitForScan(intervalMs = 2000) {
+  for (;;) {
+    await new Promise((resolve) => setTimeout(resolve, intervalMs));
+    const r = await fetch(`${API}/scan/status`);
+    const data = await r.json();
+    if (!r.ok) throw new Error(data.detail || 'Scan status failed');
+    if (data.status === 'done') return data.result;
+    if (data.status === 'failed') throw new Error(data.error || 'Scan failed');
+    // idle: the server lost track of the scan (e.g. it restarted), so stop polling
+    if (data.status === 'idle') throw new Error('scan status lost (server restarted?)');
+  }
+}
+
 async function runScan() {
   const btn = document.getElementById('scanBtn');
   btn.classList.add('loading');
@@ -82,7 +95,9 @@ async function runScan() {
     const r = await fetch(`${API}/scan`, { method: 'POST' });
     const data = await r.json();
     if (!r.ok) throw new Error(data.detail || 'Scan failed');
-    setStatus(`Scan done: ${data.added} added, ${data.removed} removed, ${data.total} total.`);
+    if (data.status === 'already_running') setStatus('Scan already running...');
+    const result = await waitForScan();
+    setStatus(`Scan done: ${result.added} added, ${result.removed} removed, ${result.total} total.`);
     await loadGames();
   } catch (e) {
     setStatus('Scan error: ' + e.message, true);